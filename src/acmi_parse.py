@@ -48,6 +48,17 @@ ACTION_REMOVE = "-"
 ACTION_TIME = "#"
 ACTION_GLOBAL = "global"
 
+# Position fields of the T property, keyed by the number of pipe separators in the value
+# Simple objects in a spherical world (2 pipes) are not supported
+_T_FIELDS = {
+    # Simple objects from a flat world
+    4: ("Longitude", "Latitude", "Altitude", "U", "V"),
+    # Complex objects in a spherical world, only sent for the bullseye which has an extra pipe bar
+    5: ("Longitude", "Latitude", "Altitude", "U", "V"),
+    # Complex object from a flat world
+    8: ("Longitude", "Latitude", "Altitude", "Roll", "Pitch", "Yaw", "U", "V", "Heading"),
+}
+
 @dataclass
 class ACMIEntry:
     """
@@ -66,7 +77,7 @@ class ACMIEntry:
     #     self.object_id = object_id
     #     self.timestamp = timestamp
 
-@dataclass
+@dataclass(slots=True)
 class Orientation:
     """
     This class represents a data structure for storing various attributes of an object.
@@ -150,6 +161,7 @@ class ACMIObject (ACMIEntry):
         super().__init__(action, object_id=object_id)
         self.T = Orientation()
         self.object_id = object_id
+        self.properties = {} # Per instance, the class level dict is shared by every object
         self.update(properties)
 
     def update(self, properties: dict):
@@ -159,16 +171,20 @@ class ACMIObject (ACMIEntry):
         Args:
             properties (dict): The properties to update.
         """
-        self.properties = {**self.properties, **properties}
+        self.properties.update(properties) # Merge in place, only the incoming properties are copied
 
-        for key, value in self.properties.items():
+        # Only the incoming properties can change an attribute, the accumulated ones were applied by earlier updates
+        for key, value in properties.items():
             
             if key == "T":
-
-                for key, value in value.items():
-                    setattr(self.T, str(key), _t_types[str(key)](value))
-            elif key in _types:
-                setattr(self, str(key), _types[str(key)](value))
+                orientation = self.T
+                for t_key, t_value in value.items():
+                    setattr(orientation, t_key, _t_types[t_key](t_value))
+            else:
+                # Single lookup for the attribute type, keys are already strings from the parser
+                attribute_type = _types.get(key)
+                if attribute_type is not None:
+                    setattr(self, key, attribute_type(value))
 
 # Do these once for performance #TODO figure out a cleaner home for these
 _types = get_type_hints(ACMIObject)
@@ -273,7 +289,7 @@ class ACMIFileParser:
                 if key in "T":
                     position_vals = self.parse_t(value)
                     if position_vals is not None:
-                        value = {key: val for key, val in position_vals.items() if val is not None}
+                        value = position_vals
                     else:
                         print(f"Invalid T value: {line}")
                         break
@@ -294,62 +310,17 @@ class ACMIFileParser:
             t (str): The position information string.
 
         Returns:
-            dict: The parsed position information as a dictionary.
+            dict: The parsed position information as a dictionary, fields left empty (unchanged) are omitted.
         """
         data = t.split('|')
-        num_pipes = t.count('|')
+        num_pipes = len(data) - 1
         
-        if num_pipes == 2:
-            # Simple objects in a spherical world
+        # The bullseye's extra pipe bar (5 pipes) is handled by _T_FIELDS, no need to report it on every update
+        fields = _T_FIELDS.get(num_pipes)
+        if fields is None:
             return None
-
-        if num_pipes == 4:
-            # Simple objects from a flat world
-            lon, lat, alt, u, v = map(lambda x: float(x.strip()) if x.strip() else None, data)
-            return {
-                "Longitude": lon,
-                "Latitude": lat,
-                "Altitude": alt,
-                "U": u,
-                "V": v
-            }
-
-        if num_pipes == 5:
-            # Complex objects in a spherical world
-            
-            # START HACK FOR EXTRA PIPE BAR IN BULLSEYE
-            #Todo remove when the extra pipe bar is removed
-            print(f"FIX ME | Extra pipe bar in bullseye: {t}")
-            lon, lat, alt, u, v, tmp = map(lambda x: float(x.strip()) if x.strip() else None, data)
-            return {
-                "Longitude": lon,
-                "Latitude": lat,
-                "Altitude": alt,
-                "U": u,
-                "V": v
-            }
-            
-            #END HACK
-            
-            return None
-
-        if num_pipes == 8:
-            # Complex object from a flat world
-            elements = map(lambda x: float(x.strip()) if x.strip() else None, data)
-            lon, lat, alt, roll, pitch, yaw, u, v, heading = elements
-            return {
-                "Longitude": lon,
-                "Latitude": lat,
-                "Altitude": alt,
-                "Roll": roll,
-                "Pitch": pitch,
-                "Yaw": yaw,
-                "U": u,
-                "V": v,
-                "Heading": heading
-            }
-
-        return None  # Invalid format
+        
+        return {field: float(value) for field, value in zip(fields, data) if value.strip()}
 
 if __name__ == "__main__":
     from pprint import pprint
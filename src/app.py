@@ -12,6 +12,7 @@ from radar import Radar
 from game_state import GameState
 from ui.user_interface import UserInterface
 from trtt_client import TRTTClientThread
+from pygame_utils import get_sys_font
 
 MOUSEDRAGBUTTON = 3
 MOUSEBRAABUTTON = 1
@@ -81,7 +82,9 @@ class App:
         }
        
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("Arial", 18) 
+        self.font = get_sys_font("Arial", 18) 
+        self._fps_text = ""
+        self._fps_surface: pygame.Surface
         self._running = True
          
     def on_event(self, event: pygame.event.Event):
@@ -200,8 +203,10 @@ class App:
         Displays the current FPS (frames per second) on the top left corner of the display.
         """
         fps = str(int(self.clock.get_fps()))
-        fps_t = self.font.render(fps , True, pygame.Color("RED"))
-        self._display_surf.blit(fps_t,(0,0))
+        if fps != self._fps_text: # Only re-render the text when the value changes
+            self._fps_text = fps
+            self._fps_surface = self.font.render(fps , True, pygame.Color("RED"))
+        self._display_surf.blit(self._fps_surface,(0,0))
             
     def __del__(self):
         self.data_client.stop()        
\ No newline at end of file
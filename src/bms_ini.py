@@ -2,6 +2,7 @@ import configparser
 import pygame
 
 from bms_math import BMS_FT_PER_M, world_to_canvas
+from pygame_utils import get_sys_font
 
 BMS_NUM_LINES = 4
 BMS_LINE_POINTS = 6
@@ -14,7 +15,7 @@ class FalconBMSIni:
         self.lines = []
         self.threats = []
         self.load()
-        self.font = pygame.font.SysFont("Arial", 18) #TODO: render this in the screen surface to not have variable font size with map zoom
+        self.font = get_sys_font("Arial", 18) #TODO: render this in the screen surface to not have variable font size with map zoom
 
     def load(self):
         with open(self.file_path, "r") as f:
@@ -41,14 +42,18 @@ class FalconBMSIni:
         
     def draw_line(self, surface, line, color):
         
-        for i in range(0, len(line)-1):
-            if (line[i][0] < 1 or line[i+1][0] < 1):
+        # Unset points break the line, draw each unbroken run of points with one call
+        run = []
+        for point in line:
+            if point[0] < 1:
+                if len(run) > 1:
+                    pygame.draw.lines(surface, color, False, run, width=2)
+                run = []
                 continue
+            run.append(world_to_canvas(point, surface.get_size()))
             
-            point1 = world_to_canvas(line[i], surface.get_size())
-            point2 = world_to_canvas(line[i+1], surface.get_size())
-        
-            pygame.draw.line(surface, color, point1, point2, width=2)
+        if len(run) > 1:
+            pygame.draw.lines(surface, color, False, run, width=2)
         
     def draw_threat(self, surface, threat, color):
         
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 THEATRE_DEFAULT_SIZE = 1024
 NM_TO_METERS = 1852
 METERS_TO_FT = 3.28084
@@ -40,12 +42,42 @@ def world_to_canvas(worldCoords: tuple[float,float], canvas_size: tuple[float,fl
     return canvasX, canvasY
 
 def screen_to_world(screenCoords: tuple[int,int], canvas_size: tuple[float,float], 
-                    scale: float, offset: tuple[float,float]) -> tuple[float,float]:
-    return canvas_to_world(screen_to_canvas(screenCoords, scale, offset), canvas_size)
+                    scale: float, offset: tuple[float,float], 
+                    theatre_size_meters = THEATRE_DEFAULT_SIZE_METERS) -> tuple[float,float]:
+    # screen_to_canvas and canvas_to_world fused into one step, same arithmetic without the intermediate tuple
+    map_size_x, map_size_y = canvas_size
+    
+    pos_ux = (screenCoords[0] - offset[0]) / scale / map_size_x * theatre_size_meters
+    pos_vy = theatre_size_meters - ((screenCoords[1] - offset[1]) / scale / map_size_y * theatre_size_meters)
+    return pos_ux, pos_vy
                                     
 def world_to_screen(worldCoords: tuple[float,float], canvas_size: tuple[float,float], 
-                    scale: float = 1, offset: tuple[float,float] = (0,0)) -> tuple[int,int]:
-    return canvas_to_screen(world_to_canvas(worldCoords, canvas_size), scale, offset)
+                    scale: float = 1, offset: tuple[float,float] = (0,0), 
+                    theatre_size_meters = THEATRE_DEFAULT_SIZE_METERS) -> tuple[int,int]:
+    # world_to_canvas and canvas_to_screen fused into one step, same arithmetic without the intermediate tuple
+    map_size_x, map_size_y = canvas_size
+    
+    screenX = int((worldCoords[0] / theatre_size_meters * map_size_x) * scale + offset[0])
+    screenY = int(((theatre_size_meters - worldCoords[1]) / theatre_size_meters * map_size_y) * scale + offset[1])
+    return screenX, screenY
+
+def world_to_screen_array(worldCoords: np.ndarray, canvas_size: tuple[float,float], 
+                          scale: float = 1, offset: tuple[float,float] = (0,0),
+                          theatre_size_meters = THEATRE_DEFAULT_SIZE_METERS) -> np.ndarray:
+    """
+    Vectorized world_to_screen for an (N, 2) array of world coordinates, gives the same results as calling
+    world_to_screen on each row.
+
+    Returns:
+        np.ndarray: (N, 2) integer array of screen coordinates.
+    """
+    map_size_x, map_size_y = canvas_size
+    
+    # Assigning into an int array truncates like the int() in canvas_to_screen, without an extra astype copy
+    screen = np.empty(worldCoords.shape, dtype=int)
+    screen[:,0] = (worldCoords[:,0] / theatre_size_meters * map_size_x) * scale + offset[0]
+    screen[:,1] = ((theatre_size_meters - worldCoords[:,1]) / theatre_size_meters * map_size_y) * scale + offset[1]
+    return screen
 
 def world_distance(worldCoords1: tuple[float,float], worldCoords2: tuple[float,float]) -> float:
     return math.sqrt((worldCoords2[0] - worldCoords1[0])**2 + (worldCoords2[1] - worldCoords1[1])**2) / NM_TO_METERS
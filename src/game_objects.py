@@ -7,9 +7,21 @@ import config
 from bms_math import *
 from typing import Callable, Any
 from acmi_parse import ACMIObject
-from pygame_utils import draw_dashed_line
+from pygame_utils import draw_dashed_line, get_sys_font, render_text_cached
 
-font : pygame.font.Font | None = None
+NAME_LINE_COLOR = pygame.Color("white") # Parsed once, looking up a color by name is slow in the draw loop
+
+color_switches: list[tuple[pygame.Color, pygame.Color]] | None = None # Parsed on first use, not for every new object
+
+def load_color_switches() -> list[tuple[pygame.Color, pygame.Color]]:
+    switches = []
+    for i in config.app_config.get("map", "unit_color_switching", list):
+        if isinstance(i[1], list):
+            replacement = pygame.Color(i[1])
+        else:
+            replacement = pygame.Color(i[1][0], i[1][1], i[1][2])
+        switches.append((pygame.Color(i[0]), replacement))
+    return switches
 
 class GameCoalition:
     pass
@@ -19,6 +31,7 @@ class GameObject:
     #font = pygame.font.SysFont("Courier New Regular", 18)
     # font = pygame.font.SysFont("Lucida Sans Typewriter", 18)
     hide_class = True
+    draws_off_screen = False # Whether the object can still be visible when its position is off screen
    
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
         self.data: ACMIObject = object
@@ -28,30 +41,27 @@ class GameObject:
         self.override_name: str | None = None
         self.override_color: pygame.Color | None = None
         
-        global font
-        if font is None:
-            font = pygame.font.SysFont("couriernewbold", 22)
-        self.font = font
+        self.font = get_sys_font("couriernewbold", 22)
         
         self.color = pygame.Color(self.data.Color)
 
         # Switch the object's color from its default to a respective replacement color
-        for i in config.app_config.get("map", "unit_color_switching", list):
-            if self.color == pygame.Color(i[0]):
-                if isinstance(i[1], list):
-                    self.color = pygame.Color(i[1])
-                else:
-                    self.color = pygame.Color(i[1][0], i[1][1], i[1][2])
+        global color_switches
+        if color_switches is None:
+            color_switches = load_color_switches()
+        for default_color, replacement_color in color_switches:
+            if self.color == default_color:
+                self.color = pygame.Color(replacement_color)
         
     def get_display_name(self) -> str:
 
         if self.override_name is not None and self.override_name != "":
-            return f"{self.override_name}"
+            return self.override_name
         
         elif self.data.Pilot != "":
-            return f"{self.data.Pilot}"
+            return self.data.Pilot
         
-        return f"{self.data.Type}"
+        return self.data.Type
         
     def update(self, object: ACMIObject):
         self.data.update(object.properties)
@@ -64,6 +74,10 @@ class GameObject:
         
     def get_color(self) -> pygame.Color:
         return self.color
+    
+    def get_draw_color(self) -> pygame.Color:
+        """The color to draw with, the user's override takes precedence over the object's own color."""
+        return self.override_color if self.override_color is not None else self.color
         
     def hide(self):
         self.visible = False
@@ -116,10 +130,27 @@ class Bullseye(MapAnnotation):
     BULLSEYE_NUM_RINGS = 8
     BULLSEYE_RING_NM = 20 # 20nm per ring
     hide_class = False
+    draws_off_screen = True # The rings reach the screen long before the center does
     
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(50,50,50,100)):
         super().__init__(object, color)
         self.override_color = pygame.Color(50,50,50,100)
+        self._geometry_px_per_nm: float | None = None
+        self._ring_radii_px: list[float] = []
+        self._cross_half_len_px: float = 0
+        self._layer: pygame.Surface | None = None
+        
+    def _update_geometry(self, px_per_nm: float) -> None:
+        """
+        Recomputes the ring radii and cross size, these only change when the map scale does.
+
+        Args:
+            px_per_nm (float): The number of pixels per nautical mile.
+        """
+        px_per_ring =  px_per_nm * self.BULLSEYE_RING_NM
+        self._ring_radii_px = [px_per_ring*i for i in range(1,self.BULLSEYE_NUM_RINGS)]
+        self._cross_half_len_px = px_per_ring*self.BULLSEYE_NUM_RINGS
+        self._geometry_px_per_nm = px_per_nm
 
     def draw(self,  surface: pygame.Surface, pos: tuple[float, float], px_per_nm: float, line_width: int = 2) -> None:
             """
@@ -133,20 +164,60 @@ class Bullseye(MapAnnotation):
             if self.hide_class or not self.visible:
                 return  # Don't draw if hidden
             
-            color = self.color
-            if self.override_color is not None:
-                color = self.override_color
+            color = self.get_draw_color()
+            
+            if px_per_nm != self._geometry_px_per_nm:
+                self._update_geometry(px_per_nm)
+                
+            # Distance from the bullseye to the nearest and farthest points of the screen, a ring is only
+            # visible if its radius falls between the two. Drawing large off-screen circles is expensive when zoomed in
+            rect = surface.get_rect()
+            near_x = max(rect.left - pos[0], 0, pos[0] - rect.right)
+            near_y = max(rect.top - pos[1], 0, pos[1] - rect.bottom)
+            far_x = max(pos[0] - rect.left, rect.right - pos[0])
+            far_y = max(pos[1] - rect.top, rect.bottom - pos[1])
+            min_visible_px = math.hypot(near_x, near_y) - line_width
+            max_visible_px = math.hypot(far_x, far_y) + line_width
+            
+            half_len = self._cross_half_len_px
+            if half_len < min_visible_px:
+                return  # Entire bullseye is off screen
+            
+            if color.a == 255:
+                self._draw_shape(surface, pos, color, line_width, min_visible_px, max_visible_px)
+                return
             
-            px_per_ring =  px_per_nm * self.BULLSEYE_RING_NM
+            # pygame.draw doesn't blend, so draw translucent bullseyes onto a layer covering just the visible part
+            layer_rect = pygame.Rect(0, 0, 2*(half_len+line_width), 2*(half_len+line_width))
+            layer_rect.center = pos
+            layer_rect = layer_rect.clip(rect)
+            if layer_rect.width < 1 or layer_rect.height < 1:
+                return  # Bullseye only touches the screen edge, nothing to draw
+            # The visible part changes size on every pan, only reallocate when the layer has to grow and use a
+            # subsurface of it otherwise
+            if self._layer is None:
+                self._layer = pygame.Surface(layer_rect.size, pygame.SRCALPHA)
+            elif layer_rect.width > self._layer.get_width() or layer_rect.height > self._layer.get_height():
+                self._layer = pygame.Surface((max(layer_rect.width, self._layer.get_width()), 
+                                              max(layer_rect.height, self._layer.get_height())), pygame.SRCALPHA)
+            layer = self._layer.subsurface((0, 0), layer_rect.size)
+            layer.fill((0,0,0,0))
+                
+            layer_pos = (pos[0]-layer_rect.left, pos[1]-layer_rect.top)
+            self._draw_shape(layer, layer_pos, color, line_width, min_visible_px, max_visible_px)
+            surface.blit(layer, layer_rect)
+            
+    def _draw_shape(self, surface: pygame.Surface, pos: tuple[float, float], color: pygame.Color, line_width: int,
+                    min_visible_px: float, max_visible_px: float) -> None:
 
-            for i in range(1,self.BULLSEYE_NUM_RINGS):
-                pygame.draw.circle(surface, color, pos, px_per_ring*i, line_width) # Draw 20nm circle
+            for radius in self._ring_radii_px:
+                if min_visible_px <= radius <= max_visible_px:
+                    pygame.draw.circle(surface, color, pos, radius, line_width) # Draw 20nm circle
             
             # draw cross
-            pygame.draw.line(surface, color, (pos[0]-px_per_ring*self.BULLSEYE_NUM_RINGS, pos[1]), 
-                            (pos[0]+px_per_ring*self.BULLSEYE_NUM_RINGS, pos[1]), line_width)
-            pygame.draw.line(surface, color, (pos[0], pos[1]-px_per_ring*self.BULLSEYE_NUM_RINGS),
-                            (pos[0], pos[1]+px_per_ring*self.BULLSEYE_NUM_RINGS), line_width)
+            half_len = self._cross_half_len_px
+            pygame.draw.line(surface, color, (pos[0]-half_len, pos[1]), (pos[0]+half_len, pos[1]), line_width)
+            pygame.draw.line(surface, color, (pos[0], pos[1]-half_len), (pos[0], pos[1]+half_len), line_width)
 
 class groundUnit(GameObject):
     
@@ -160,9 +231,7 @@ class groundUnit(GameObject):
         if not self.is_visible(surface, pos):
             return  # Don't draw if not visible
 
-        color = self.color
-        if self.override_color is not None:
-            color = self.override_color
+        color = self.get_draw_color()
             
         size = 5           
         
@@ -173,10 +242,16 @@ class airUnit(GameObject):
     
     hide_class = False
     
+    VELOCITY_VECTOR_SECONDS = 30 # 30 seconds of velocity vector
+    VELOCITY_VECTOR_SCALE = VELOCITY_VECTOR_SECONDS / NM_TO_METERS # Speed (m/s) * px per nm * scale = line length in px
+    
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
         super().__init__(object, color)
         self.locked_target: GameObject | None = None
-
+        self._text_info_key: tuple | None = None
+        self._text_info_surface: pygame.Surface
+        self._heading: float | None = None # Heading the cached direction below was computed for
+        self._heading_vector: tuple[float,float] = (0.0, 0.0)
                 
     def get_surface(self, px_per_meter) -> pygame.Surface:
         size = (20,20)
@@ -200,9 +275,7 @@ class airUnit(GameObject):
         if not self.is_visible(surface, pos):
             return  # Don't draw if not visible
         
-        color = self.color
-        if self.override_color is not None:
-            color = self.override_color
+        color = self.get_draw_color()
 
         size = 14
 
@@ -220,7 +293,7 @@ class airUnit(GameObject):
 
         # Draw Name Line
         # Draw a line from the top left of the contact to the right side of the name
-        pygame.draw.line(surface, pygame.Color("white"), contactrect.topleft, textrect.midright, 2)
+        pygame.draw.line(surface, NAME_LINE_COLOR, contactrect.topleft, textrect.midright, 2)
 
         # Draw Velocity Line
         vec = self._getVelocityVector(px_per_nm) # returns line starting at 0,0
@@ -240,20 +313,33 @@ class airUnit(GameObject):
         calibratedspeed = self.data.CAS
         
         text = self.get_display_name()
+        altitude_hundreds_ft = int(altitude*METERS_TO_FT//100)
+        speed_tens_kts = int(int(calibratedspeed)*M_PER_SEC_TO_KNOTS)//10
+        
+        # The info box only changes when its displayed values or color do, reuse the last render otherwise
+        text_info_key = (text, self.data.Name, altitude_hundreds_ft, speed_tens_kts, color)
+        if text_info_key == self._text_info_key:
+            return self._text_info_surface
         
-        name_surface = self.font.render(f"{text}", True, color)
-        type_surface = self.font.render(f"{self.data.Name}", True, color)
-        data_surface = self.font.render(
-            f"{int(altitude*METERS_TO_FT//100)}  {(int(int(calibratedspeed)*M_PER_SEC_TO_KNOTS)//10)}", True, color)
+        name_surface = render_text_cached(self.font, text, color)
+        type_surface = render_text_cached(self.font, self.data.Name, color)
+        data_surface = render_text_cached(self.font, f"{altitude_hundreds_ft}  {speed_tens_kts}", color)
         
         textrect = (max(name_surface.get_size()[0], data_surface.get_size()[0], type_surface.get_size()[0]), 
                    name_surface.get_size()[1]+ data_surface.get_size()[1] + type_surface.get_size()[1])
-        surface = pygame.Surface(textrect, pygame.SRCALPHA)
+        # Speed and altitude changes rarely change the box size, redraw into the previous surface when they don't
+        if self._text_info_key is not None and self._text_info_surface.get_size() == textrect:
+            surface = self._text_info_surface
+        else:
+            surface = pygame.Surface(textrect, pygame.SRCALPHA)
         surface.fill((0,0,0,0))
-        surface.blit(name_surface, (textrect[0]-name_surface.get_width() ,0))
-        surface.blit(type_surface, (textrect[0]-type_surface.get_width(),name_surface.get_size()[1]))
-        surface.blit(data_surface, (textrect[0]-data_surface.get_width(),name_surface.get_size()[1] + type_surface.get_size()[1]))
+        surface.blits(((name_surface, (textrect[0]-name_surface.get_width() ,0)),
+                       (type_surface, (textrect[0]-type_surface.get_width(),name_surface.get_size()[1])),
+                       (data_surface, (textrect[0]-data_surface.get_width(),name_surface.get_size()[1] + type_surface.get_size()[1]))),
+                      doreturn=False)
         
+        self._text_info_key = text_info_key
+        self._text_info_surface = surface
         return surface
             
     def _getVelocityVector(self, px_per_nm: float, heading: float | None = None, line_scale: int = 3) -> tuple[float,float]:
@@ -267,13 +353,15 @@ class airUnit(GameObject):
         Returns:
             tuple[float,float]: The end point of the velocity vector.
         """
-        LINE_LEN_SECONDS = 30 # 30 seconds of velocity vector
-        px_per_second = px_per_nm * self.data.CAS / NM_TO_METERS # Scale the velocity vector 
-        vel_vec_len_px = px_per_second * LINE_LEN_SECONDS # Scale the velocity vector
-
-        heading_rad = math.radians(self.data.T.Heading-90) # -90 rotaes north to up
-        end_x = vel_vec_len_px*math.cos(heading_rad)
-        end_y = vel_vec_len_px*math.sin(heading_rad)
+        vel_vec_len_px = px_per_nm * self.data.CAS * self.VELOCITY_VECTOR_SCALE # Scale the velocity vector
+
+        # Headings change far less often than frames are drawn, only redo the trig when it does
+        if self.data.T.Heading != self._heading:
+            heading_rad = math.radians(self.data.T.Heading-90) # -90 rotaes north to up
+            self._heading_vector = (math.cos(heading_rad), math.sin(heading_rad))
+            self._heading = self.data.T.Heading
+        end_x = vel_vec_len_px*self._heading_vector[0]
+        end_y = vel_vec_len_px*self._heading_vector[1]
         end_pt = (end_x, end_y)
 
         return end_pt
@@ -282,25 +370,43 @@ class missile(airUnit):
     
     hide_class = False
     
+    MISSILE_SIZE = 12
+    # Missile shape around origin, built once instead of on every draw
+    # MISSILE_POINTS = np.array([(0,-size), (-size/2, size/2), (size/2, size/2)])
+    MISSILE_POINTS = np.array([(0,MISSILE_SIZE), (-MISSILE_SIZE/2, -MISSILE_SIZE/2), (MISSILE_SIZE/2, -MISSILE_SIZE/2)])
+    
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
         super().__init__(object, color)
+        self._rotated_points_heading: float | None = None
+        self._rotated_points: np.ndarray = self.MISSILE_POINTS
     
     def draw(self, surface: pygame.Surface, pos, px_per_nm, target_pos=None):
         
         if not self.is_visible(surface, pos):
             return  # Don't draw if not visible
 
-        color = self.color
-        if self.override_color is not None:
-            color = self.override_color              
+        color = self.get_draw_color()
         
-        size = 12
+        # Only rotate the shape again when the heading changed, translating it is all that's left per frame
+        if self.data.T.Heading != self._rotated_points_heading:
+            self._rotated_points = self._rotate_shape(self.data.T.Heading)
+            self._rotated_points_heading = self.data.T.Heading
         
-        # Define missile shape around origin        
-        # missile_points = np.array([(0,-size), (-size/2, size/2), (size/2, size/2)])
-        missile_points = np.array([(0,size), (-size/2, -size/2), (size/2, -size/2)])
+        # translate shape to contact position
+        missile_points = self._rotated_points + pos
         
-        heading_rad = math.radians(self.data.T.Heading)
+        # draw shape at contact position
+        for point in missile_points.tolist(): # Plain lists are cheaper for pygame to read than numpy rows
+            pygame.draw.line(surface, color, pos, point, 2)
+        
+        # draw dotted lock line to target
+        if target_pos is not None:
+            # pygame.draw.line(surface, color, pos, target_pos, 2)
+            draw_dashed_line(surface, color, pos, target_pos, 1, 6)
+            
+    def _rotate_shape(self, heading: float) -> np.ndarray:
+        
+        heading_rad = math.radians(heading)
         
         # rotate shape around orgin towards heading
         # transformation_mat = ((math.cos(heading_rad), math.sin(heading_rad)),
@@ -316,19 +422,8 @@ class missile(airUnit):
         # x' = x cos T - y sin T
         # y' = y cos T + x sin T
         
-        # translate and rotate shape to contact position
-        for i in range(len(missile_points)):
-            rotated_point = np.matmul(missile_points[i], transformation_mat)
-            missile_points[i] = np.add(rotated_point, pos)
-        
-        # draw shape at contact position
-        for point in missile_points:
-            pygame.draw.line(surface, color, pos, point, 2)
-        
-        # draw dotted lock line to target
-        if target_pos is not None:
-            # pygame.draw.line(surface, color, pos, target_pos, 2)
-            draw_dashed_line(surface, color, pos, target_pos, 1, 6)
+        # rotate shape around origin, all points in one matmul
+        return np.matmul(self.MISSILE_POINTS, transformation_mat)
     
 class fixedWing(airUnit):
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
@@ -338,13 +433,15 @@ class rotaryWing(airUnit):
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
         super().__init__(object, color)
         
-    def draw(self, surface: pygame.Surface, pos, px_per_nm, target_pos=None) -> None:
-        super().draw(surface, pos, px_per_nm, target_pos=target_pos)
-        
 class surfaceVessel(groundUnit):
     
     hide_class = False
     
+    SHIP_SIZE = 20
+    # Ship shape around origin, built once instead of on every draw
+    SHIP_POINTS = np.array([(-SHIP_SIZE/2,0), (-SHIP_SIZE/4,0), (-SHIP_SIZE/4,-SHIP_SIZE/4), (SHIP_SIZE/4,-SHIP_SIZE/4), 
+                            (SHIP_SIZE/4,0), (SHIP_SIZE/2,0), (SHIP_SIZE/4, SHIP_SIZE/4), (-SHIP_SIZE/4, SHIP_SIZE/4)])
+    
     def __init__(self, object: ACMIObject, color: pygame.Color = pygame.Color(255,255,255)):
         super().__init__(object, color)
         
@@ -353,19 +450,9 @@ class surfaceVessel(groundUnit):
         if not self.is_visible(surface, pos):
             return  # Don't draw if not visible
 
-        color = self.color
-        if self.override_color is not None:
-            color = self.override_color       
+        color = self.get_draw_color()
         
-        size = 20
-        # Define ship shape around origin        
-        half = size/2
-        qtr = size/4
-        ship_points = np.array([(-half,0), (-qtr,0), (-qtr,-qtr), (qtr,-qtr), (qtr,0), (half,0), 
-                                (qtr, qtr), (-qtr, qtr)])
-
-        # translate and rotate shape to contact position
-        for i in range(len(ship_points)):
-            ship_points[i] = np.add(ship_points[i], pos)
+        # translate shape to contact position
+        ship_points = self.SHIP_POINTS + pos
 
-        pygame.draw.polygon(surface, color, list(map(tuple, ship_points)), 2) # This is suprisingly slow #TODO make sprite and render
\ No newline at end of file
+        pygame.draw.polygon(surface, color, ship_points.tolist(), 2) # This is suprisingly slow #TODO make sprite and render
\ No newline at end of file
@@ -1,9 +1,7 @@
 import acmi_parse
 import datetime
-from trtt_client import TRTTClientThread
 import queue 
-import pygame
-import math
+import numpy as np
 
 from typing import Type
 
@@ -13,7 +11,9 @@ from game_objects import *
 # TODO: If perfomance becomes an issues consider reimplementing this list.
 HIDDEN_OBJECT_CLASSES = ("Static", "Projectile", "Vehicle", "Flare", "Chaff", "Explosion", "Parachutist", "Bomb", "Rotorcraft") 
 
-CLASS_MAP = {
+SUPPORTED_CLASSES = Bullseye | fixedWing | rotaryWing | missile | groundUnit | surfaceVessel
+
+CLASS_MAP: dict[str, Type[SUPPORTED_CLASSES]] = {
     "Navaid+Static+Bullseye": Bullseye,
     "FixedWing": fixedWing,
     "Rotorcraft": rotaryWing,
@@ -22,7 +22,22 @@ CLASS_MAP = {
     "Watercraft": surfaceVessel
 }
 
-SUPPORTED_CLASSES = Bullseye | fixedWing | rotaryWing | missile | groundUnit | surfaceVessel
+_class_by_type: dict[str, Type[SUPPORTED_CLASSES] | None] = {} # Type strings already matched against CLASS_MAP
+
+def get_object_class(object_type: str) -> Type[SUPPORTED_CLASSES] | None:
+    """
+    Finds the game object class for an ACMI type string, the first CLASS_MAP key contained in it wins.
+    Matches are remembered so each distinct type string is only scanned once.
+
+    Args:
+        object_type (str): The ACMI Type property, e.g. "Air+FixedWing".
+
+    Returns:
+        Type[SUPPORTED_CLASSES] | None: The matching class, None if the type is not supported.
+    """
+    if object_type not in _class_by_type:
+        _class_by_type[object_type] = next((clas for key, clas in CLASS_MAP.items() if key in object_type), None)
+    return _class_by_type[object_type]
 
 class GameState:
     """
@@ -44,6 +59,7 @@ class GameState:
         
         self.objects: dict[Type[SUPPORTED_CLASSES], dict["str", GameObject] ] = {clas: dict() for clas in CLASS_MAP.values()}
         self.all_objects: dict["str", GameObject] = dict()
+        self.version = 0 # Incremented whenever data is processed, lets views know when their cached object data is stale
         # Create the ACMI parser
         self.parser = acmi_parse.ACMIFileParser()
         
@@ -62,6 +78,7 @@ class GameState:
             line = self.data_queue.get()
             # print(line)
             if line is None: break # End of data
+            self.version += 1
 
             acmiline = self.parser.parse_line(line) # Parse the line into a dict
             if acmiline is None: 
@@ -107,18 +124,18 @@ class GameState:
         Returns:
             str: The object ID of the object being hovered over.
         """
-        closest = None
-        closest_dist = float('inf')
-        for id in self.all_objects:
-            obj = self.all_objects[id]
-            dist = math.dist(world_pos, (obj.data.T.U, obj.data.T.V))
-            if dist < closest_dist:
-                closest = obj
-                closest_dist = dist
-
-        if closest is None or closest_dist > hover_dist_world:
+        if len(self.all_objects) == 0:
+            return None
+        
+        # Find the minimum distance in one vectorized pass instead of a python loop over every object
+        objects = list(self.all_objects.values())
+        positions = np.array([(obj.data.T.U, obj.data.T.V) for obj in objects], dtype=float)
+        distances = np.hypot(positions[:, 0] - world_pos[0], positions[:, 1] - world_pos[1])
+        closest_index = int(np.argmin(distances))
+
+        if distances[closest_index] > hover_dist_world:
             return None
-        return closest
+        return objects[closest_index]
 
     def _remove_object(self, object_id: str) -> None:
         """
@@ -127,11 +144,10 @@ class GameState:
         Args:
             object_id (str): The ID of the object to remove.
         """       
-        for subdict in self.objects.values():
-            if object_id in subdict:
-                del subdict[object_id]
-                del self.all_objects[object_id]
-                return
+        obj = self.all_objects.pop(object_id, None)
+        if obj is not None:
+            del self.objects[type(obj)][object_id] # Objects are filed under their own class, no need to search
+            return
             
         # print(f"tried to delete object {object_id} not in self.objects")  #TODO handle objects not in CLASS_MAP
         
@@ -144,21 +160,22 @@ class GameState:
             updateObj (AcmiParse.ACMIObject): The Object with the new data to update.
         """
 
-        if updateObj.object_id in self.all_objects:
-            self.all_objects[updateObj.object_id].update(updateObj)
-            self._update_target_lock(self.all_objects[updateObj.object_id])
+        existing = self.all_objects.get(updateObj.object_id)
+        if existing is not None:
+            existing.update(updateObj)
+            self._update_target_lock(existing)
         else:
-            for key in CLASS_MAP:
-                if key in updateObj.Type:
-                    subdict = self.objects[CLASS_MAP[key]]
-                    subdict[updateObj.object_id] = CLASS_MAP[key](updateObj)
-                    self.all_objects[updateObj.object_id] = subdict[updateObj.object_id]
-                    break
+            object_class = get_object_class(updateObj.Type)
+            if object_class is not None:
+                new_object = object_class(updateObj)
+                self.objects[object_class][updateObj.object_id] = new_object
+                self.all_objects[updateObj.object_id] = new_object
         
     def _update_target_lock(self, updateObj: GameObject) -> None:
         if updateObj.data.LockedTarget not in [None, "", "0"]:
-            if updateObj.data.LockedTarget in self.all_objects:
-                updateObj.locked_target = self.all_objects[updateObj.data.LockedTarget]
+            target = self.all_objects.get(updateObj.data.LockedTarget)
+            if target is not None:
+                updateObj.locked_target = target
             else:
                 print(f"Target {updateObj.data.LockedTarget} not found")
         else:
@@ -170,4 +187,6 @@ class GameState:
         """
         Clear the game state.
         """
-        self.__init__(self.data_queue)
\ No newline at end of file
+        version = self.version
+        self.__init__(self.data_queue)
+        self.version = version + 1 # Keep counting up so cached data from before the clear is never mistaken as current
\ No newline at end of file
@@ -2,6 +2,7 @@ import pygame
 
 from bms_ini import FalconBMSIni
 from os_uils import open_file_dialog
+from pygame_utils import get_sys_font, render_text_cached
 
 import config
 
@@ -13,6 +14,11 @@ THEATRE_MAPS_BUILTIN = [{"name": "Balkans", "path": "resources/maps/balkans_4k_a
                         {"name": "Israel", "path": "resources/maps/Israel.jpg", "size": 1024},
                         {"name": "MidEast", "path": "resources/maps/MidEast128Map.png", "size": 1024},]
 
+SCALE_COLOR = pygame.Color("white")
+MAP_SCALED_MAX_SCREENS = 4 # The whole map is kept scaled while it is at most this many screens in area
+SCALE_GRADUATIONS_NM = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SCALE_LABELS = {graduation_nm: f"{graduation_nm} NM" for graduation_nm in SCALE_GRADUATIONS_NM}
+
 class Map:
     def __init__(self, displaysurface: pygame.Surface):
         super().__init__()
@@ -21,22 +27,27 @@ class Map:
         self.size = self.width, self.height = displaysurface.get_size()[0], displaysurface.get_size()[1] - 74 # 74 is the height of the UI panel #TODO parameterize this
         self._map_source = pygame.Surface(self.size)
         self._map_annotated = pygame.Surface(self.size)
-        self._map_quick_scaled = pygame.Surface(self.size)
         
         self.offset = pygame.Vector2(0,0) # Coordinate for the top left corner of the zoomed map in the original map 
         self._zoom_level = 0
-        self._scale_new = 1
         self.screen_offset = pygame.Vector2(0,0)
+        self.map_scaled = pygame.Surface(self.size) # Replaced by the scaled map on the first render
+        self._map_transform_key: tuple | None = None
+        self._map_scaled_whole_scale: float | None = None # Scale of map_scaled when it holds the whole map
+        self._map_dirty = False # Set by pan/zoom, the map is rescaled once at the next render
+        self._scale_key: tuple | None = None
+        self._scale_lines: list[tuple[tuple[float,float], tuple[float,float]]] = []
+        self._scale_text: pygame.Surface
+        self._scale_text_pos: tuple[float,float] = (0,0)
         
         self.ini_surface = pygame.Surface(self.size)
         self.map_alpha = int(config.app_config.get("map", "map_alpha", int)) # type: ignore
         self.background_color = tuple (config.app_config.get("map", "background_color", tuple[int,int,int])) # type: ignore    
-        self.font = pygame.font.SysFont('Comic Sans MS', 10)     
+        self.font = get_sys_font('Comic Sans MS', 10)     
         active_theatre = config.app_config.get("map", "theatre", str)
         theatre = next((x for x in THEATRE_MAPS_BUILTIN if x["name"] == active_theatre), None)
 
         self._base_zoom = 1
-        self._zoom = 0
         self._scale_c2s = 1
         self.max_zoom_level = int(config.app_config.get("map", "max_zoom_level", int)) # type: ignore
         
@@ -56,9 +67,16 @@ class Map:
         self.fitInView()
         
     def on_render(self):
-        self._display_surf.fill(self.background_color) # Fill grey
-        # self._display_surf.blit(self._map_scaled,(self._offsetX,self._offsetY))
-        self._display_surf.blit(self.map_scaled, self.screen_offset)
+        if self._map_dirty:
+            self._map_dirty = False
+            self.map_transform(self._scale_c2s, self.offset)
+        # Fill grey only around the map, the opaque map blit overwrites everything underneath it anyway
+        display_rect = self._display_surf.get_rect()
+        map_rect = self._display_surf.blit(self.map_scaled, self.screen_offset)
+        self._display_surf.fill(self.background_color, (0, 0, display_rect.width, map_rect.top))
+        self._display_surf.fill(self.background_color, (0, map_rect.bottom, display_rect.width, display_rect.height - map_rect.bottom))
+        self._display_surf.fill(self.background_color, (0, map_rect.top, map_rect.left, map_rect.height))
+        self._display_surf.fill(self.background_color, (map_rect.right, map_rect.top, display_rect.width - map_rect.right, map_rect.height))
         self._draw_scale()
         
     def on_cleanup(self):
@@ -91,14 +109,19 @@ class Map:
         """Prepares the map surface by loading the map image, precalculaing the alpha with a blit and
         """
         
-        self._map_annotated = pygame.Surface(self._map_source.get_size())
+        if self._map_annotated.get_size() != self._map_source.get_size(): # Reuse the surface unless the new map has a different size
+            self._map_annotated = pygame.Surface(self._map_source.get_size())
+        self._map_transform_key = None # The map contents changed, the next render has to rescale it
+        self._map_scaled_whole_scale = None
+        self._map_dirty = True
         if self.map_alpha is not None: self._map_source.set_alpha(self.map_alpha)
         self._map_annotated.fill(self.background_color)
         self._map_annotated.blit(self._map_source, (0,0))
-        if self.ini is not None and self.ini_surface is not None:
-            self.ini_surface = self.ini.get_surf(self._map_source.get_size())
+        if self.ini is not None:
+            map_size = self._map_source.get_size()
+            if self.ini_surface is None or self.ini_surface.get_size() != map_size: # Only redraw the ini if the map size changed
+                self.ini_surface = self.ini.get_surf(map_size)
             self._map_annotated.blit(self.ini_surface, (0,0))        
-        self._map_annotated.convert()
         # self._scale_map() #TODO: remove this and replace with new
     
     def on_loop(self):
@@ -122,22 +145,21 @@ class Map:
             
     def pan(self, panVector: tuple[float,float] = (0,0) ):
 
-        self.offset += pygame.Vector2(panVector)
-        
         # Pan Limits
         pan_border = 100 # TODO configure
-        screen_size = pygame.Vector2(self.size)
-        map_size = pygame.Vector2(self._map_annotated.get_size()) * self._scale_c2s
+        screen_width, screen_height = self.size
+        map_width, map_height = self._map_annotated.get_size()
         
-        x_left = -map_size.x + pan_border
-        x_right = screen_size.x - pan_border
-        y_top = -map_size.y + pan_border
-        y_bottom = screen_size.y - pan_border
+        x_left = -map_width * self._scale_c2s + pan_border
+        x_right = screen_width - pan_border
+        y_top = -map_height * self._scale_c2s + pan_border
+        y_bottom = screen_height - pan_border
         
-        self.offset.x = pygame.math.clamp(self.offset.x, x_left, x_right)
-        self.offset.y = pygame.math.clamp(self.offset.y, y_top,  y_bottom)
+        # Update the offset in place, pans arrive with every mouse motion event
+        self.offset.x = pygame.math.clamp(self.offset.x + panVector[0], x_left, x_right)
+        self.offset.y = pygame.math.clamp(self.offset.y + panVector[1], y_top,  y_bottom)
         
-        self.map_transform(self._scale_c2s, self.offset)
+        self._map_dirty = True
         
     def resize(self, width, height):
         self.size = self.width, self.height = width, height - 74 # 74 is the height of the UI panel #TODO parameterize this
@@ -146,22 +168,38 @@ class Map:
     def fitInView(self):
         
         if self._map_annotated is not None:
-            screen_rect = pygame.Rect((0,0), self.size)
-            map_rect = pygame.Rect((0,0), self._map_annotated.get_size())
-            self._base_zoom = min(screen_rect.width / map_rect.width, screen_rect.height / map_rect.height) # Assumes map is square
+            screen_width, screen_height = self.size
+            map_width, map_height = self._map_annotated.get_size()
+            self._base_zoom = min(screen_width / map_width, screen_height / map_height) # Assumes map is square
             self._scale_c2s = self._base_zoom
-            fit_size = pygame.Vector2(int(map_rect.width * self._base_zoom), 
-                                    int(map_rect.height * self._base_zoom))
-            self.offset = pygame.Vector2((screen_rect.width - fit_size.x) // 2, (screen_rect.height - fit_size.y) // 2)
+            fit_width, fit_height = int(map_width * self._base_zoom), int(map_height * self._base_zoom)
+            self.offset = pygame.Vector2((screen_width - fit_width) // 2, (screen_height - fit_height) // 2)
 
-            self.map_transform(self._scale_c2s, self.offset)
+            self._map_dirty = True
             
     def map_transform(self, scale_m2s: float, pos: pygame.Vector2):
+        
+        # Pans against the limits and zooms past the max level don't move the map, skip rescaling it
+        transform_key = (scale_m2s, pos.x, pos.y, self.size)
+        if transform_key == self._map_transform_key:
+            return
+        
         scale_s2m = 1.0 / scale_m2s
                 
         screen_rect = pygame.Rect((0,0), self.size)
         map_rect = pygame.Rect((0,0), self._map_annotated.get_size())
         
+        # While the whole scaled map is small enough keep all of it, pans at the same zoom then only move it
+        whole_size = (int(map_rect.width * scale_m2s), int(map_rect.height * scale_m2s))
+        if whole_size[0] * whole_size[1] <= MAP_SCALED_MAX_SCREENS * screen_rect.width * screen_rect.height:
+            if scale_m2s != self._map_scaled_whole_scale:
+                self.map_scaled = pygame.transform.smoothscale(self._map_annotated, whole_size)
+                self._map_scaled_whole_scale = scale_m2s
+            self._map_transform_key = transform_key
+            self.screen_offset = pygame.Vector2(pos)
+            return
+        self._map_scaled_whole_scale = None
+        
         source_rect = pygame.Rect(-pos * scale_s2m, pygame.Vector2(screen_rect.size) * scale_s2m) 
         source_rect_clipped = source_rect.clip(map_rect)
         source_rect_clipped_offset = (-pygame.Vector2(source_rect.topleft) + pygame.Vector2(source_rect_clipped.topleft)) * scale_m2s
@@ -173,9 +211,13 @@ class Map:
         if dest_rect_clipped.width < 1 or dest_rect_clipped.height < 1:
             return
         
+        self._map_transform_key = transform_key
         self.screen_offset = pygame.Vector2(dest_rect_clipped.topleft)
         map_clipped = self._map_annotated.subsurface(source_rect_clipped)
-        self.map_scaled = pygame.transform.smoothscale(map_clipped, dest_rect_clipped.size)      
+        if self.map_scaled.get_size() == dest_rect_clipped.size:
+            pygame.transform.smoothscale(map_clipped, dest_rect_clipped.size, self.map_scaled) # Scale into the previous surface instead of allocating a new one
+        else:
+            self.map_scaled = pygame.transform.smoothscale(map_clipped, dest_rect_clipped.size)      
         
         
     def zoom(self, mousepos, y: float):
@@ -196,14 +238,13 @@ class Map:
             
             newscale = self._scale_c2s
             
-            oldmouspos = pygame.Vector2(screen_to_canvas(mousepos, oldscale, (self.offset.x, self.offset.y)))
-            newmousepos = pygame.Vector2(screen_to_canvas(mousepos, newscale, (self.offset.x, self.offset.y)))
-            
-            mouse_delta_canvas = newmousepos - oldmouspos
-            mouse_delta_screen = mouse_delta_canvas * self._scale_c2s
-            self.offset += mouse_delta_screen
+            # Keep the canvas point under the mouse fixed: its distance from the offset scales by newscale / oldscale,
+            # so the offset moves by the rest of that distance
+            pivot_shift = 1 - newscale / oldscale
+            self.offset.x += (mousepos[0] - self.offset.x) * pivot_shift
+            self.offset.y += (mousepos[1] - self.offset.y) * pivot_shift
             
-            self.map_transform(self._scale_c2s, self.offset)
+            self._map_dirty = True
                        
             
         elif self._zoom_level <= 0:
@@ -214,16 +255,32 @@ class Map:
         
     def _draw_scale(self):
         
+        # The scale bar only moves when the zoom or the screen size changes, reuse its layout otherwise
+        scale_key = (self._scale_c2s, self.size, self._map_annotated.get_width(), self.theater_max_meter)
+        if scale_key != self._scale_key:
+            self._scale_lines, self._scale_text, self._scale_text_pos = self._layout_scale()
+            self._scale_key = scale_key
+        
+        for start, end in self._scale_lines:
+            pygame.draw.line(self._display_surf, SCALE_COLOR, start, end, 2)
+  
+        self._display_surf.blit(self._scale_text, self._scale_text_pos)
+        
+    def _layout_scale(self) -> tuple[list[tuple[tuple[float,float], tuple[float,float]]], pygame.Surface, tuple[float,float]]:
+        """
+        Calculates the scale bar lines and label for the current zoom and screen size.
+
+        Returns:
+            tuple: The (start, end) points of each line, the label surface and the label position.
+        """
         bottom_extra_padding = 0 # move this up above the UI buttons TODO: move this into the UI to make it less messy
         scale_height_px = 50
         padding = 10
-        color = pygame.Color("white")
-        graduations_nm = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
         
-        scale_width_px = int(self.width / 4) # 25% of width
+        scale_width_px = self.width // 4 # 25% of width
         scale_width_m = (scale_width_px / self._scale_c2s) / self._map_annotated.get_width() * self.theater_max_meter
         scale_width_nm = scale_width_m / NM_TO_METERS
-        possible_graduations = [i for i in graduations_nm if i < scale_width_nm]
+        possible_graduations = [i for i in SCALE_GRADUATIONS_NM if i < scale_width_nm]
         if len(possible_graduations) == 0:
             max_graduation_nm = 1
         else:
@@ -236,35 +293,26 @@ class Map:
         
         scale_rect.bottomright = (self.width - padding, self.height - padding - bottom_extra_padding)
         
-        # pygame.draw.rect(self._display_surf, color, scale_rect, 2)
-        
         scale_left = (scale_rect.left + (scale_rect.width - max_graduation_px) / 2, 
                       scale_rect.top + scale_rect.height / 2)
         
         scale_right = (scale_left[0] + max_graduation_px, scale_left[1])
         
-        #Horizontal line
-        pygame.draw.line(self._display_surf, color, scale_left, 
-                         (scale_left[0] + max_graduation_px, scale_left[1]), 2)
-        
-        #Graduations
-        pygame.draw.line(self._display_surf, color, (scale_left[0], scale_left[1] - 10), 
-                         (scale_left[0], scale_left[1] + 10), 2)
-        
-        pygame.draw.line(self._display_surf, color, (scale_right[0], scale_right[1] - 10), 
-                    (scale_right[0], scale_right[1] + 10), 2)
-        
         center = scale_rect.center
         
-        pygame.draw.line(self._display_surf, color, (center[0], center[1] - 5), 
-                         (center[0], center[1] + 5), 2)
+        lines = [
+            #Horizontal line
+            (scale_left, (scale_left[0] + max_graduation_px, scale_left[1])),
+            #Graduations
+            ((scale_left[0], scale_left[1] - 10), (scale_left[0], scale_left[1] + 10)),
+            ((scale_right[0], scale_right[1] - 10), (scale_right[0], scale_right[1] + 10)),
+            ((center[0], center[1] - 5), (center[0], center[1] + 5)),
+        ]
         
         #text
-        text = self.font.render(f"{max_graduation_nm} NM", True, color)
-        text_rect = text.get_rect()
-  
-        self._display_surf.blit(text, (scale_left[0] ,scale_rect.top ))
+        text = render_text_cached(self.font, SCALE_LABELS[max_graduation_nm], SCALE_COLOR)
         
+        return lines, text, (scale_left[0], scale_rect.top)
         
     def _px_per_nm(self) -> float:
         """
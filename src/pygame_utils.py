@@ -1,6 +1,51 @@
+import functools
+
 import pygame
 import config
 
+TEXT_CACHE_MAX_ENTRIES = 4096
+_text_cache: dict[tuple, pygame.Surface] = {}
+
+def render_text_cached(font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+    """
+    Renders text with font.render, reusing the surface from an earlier call with the same arguments.
+    The returned surface is shared and must not be drawn on.
+
+    Args:
+        font (pygame.font.Font): The font to render with.
+        text (str): The text to render.
+        color: The text color.
+        antialias (bool, optional): Whether to antialias the text. Defaults to True.
+
+    Returns:
+        pygame.Surface: The rendered text.
+    """
+    key = (font, text, tuple(color), antialias)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        if len(_text_cache) >= TEXT_CACHE_MAX_ENTRIES:
+            del _text_cache[next(iter(_text_cache))] # Evict the oldest entry
+        text_surface = font.render(text, antialias, color)
+        if pygame.display.get_surface() is not None:
+            text_surface = text_surface.convert_alpha() # Cached text is blitted many times, match the display format once
+        _text_cache[key] = text_surface
+    return text_surface
+
+@functools.lru_cache(maxsize=None)
+def get_sys_font(name: str, size: int) -> pygame.font.Font:
+    """
+    Gets a system font, only looking it up and loading it from disk the first time it is requested.
+    The returned font is shared between callers.
+
+    Args:
+        name (str): The system font name.
+        size (int): The font size.
+
+    Returns:
+        pygame.font.Font: The loaded font.
+    """
+    return pygame.font.SysFont(name, size)
+
 def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=4):
     origin = pygame.Vector2(start_pos)
     target = pygame.Vector2(end_pos)
@@ -9,10 +54,20 @@ def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=4)
         return
     length = displacement.length()
     displacement.normalize_ip() #TODO some bug here, fix it later
-    for index in range(0, int(length/dash_length), 2):
-        start = origin + displacement * dash_length * index
-        end = origin + displacement * dash_length * (index + 1)
-        pygame.draw.line(surface, color, start, end, width)
+    dash = displacement * dash_length # Same for every dash, no need to rebuild it in the loop
+    
+    # Only draw the dashes that can reach the surface, long lock lines mostly run off screen when zoomed in
+    clipped = surface.get_clip().inflate(width * 2 + 2, width * 2 + 2).clipline(origin, target)
+    if not clipped:
+        return
+    t_first, t_last = sorted((pygame.Vector2(point) - origin).dot(displacement) for point in clipped)
+    first_index = max(int(t_first / dash_length) - 1, 0)
+    first_index -= first_index % 2 # Dashes start on even indices
+    last_index = min(int(t_last / dash_length) + 2, int(length/dash_length))
+    
+    for index in range(first_index, last_index, 2):
+        start = origin + dash * index
+        pygame.draw.line(surface, color, start, start + dash, width)
         
 def get_surface_from_image(image_path, surface_size = None):
     
@@ -1,13 +1,17 @@
 import pygame
 
 import pygame_gui
+import numpy as np
+
+from typing import Iterator
 
 from game_state import GameState, CLASS_MAP
 from map import Map
 
 from game_objects import *
 
-from bms_math import METERS_TO_FT
+from bms_math import METERS_TO_FT, world_to_screen_array
+from pygame_utils import get_sys_font, render_text_cached
 from messages import RADAR_SERVER_CONNECTED, RADAR_SERVER_DISCONNECTED
 from ui.context_menu import ContextMenu
 
@@ -23,36 +27,33 @@ class Radar(Map):
 
     Attributes:
         _display_surf (pygame.Surface): The surface on which the radar is displayed.
-        _radar_surf (pygame.Surface): The surface used for rendering the radar.
         _gamestate (GameState): The game state object.
         font (pygame.font.Font): The font used for rendering text on the radar.
     """
     def __init__(self, displaysurface: pygame.Surface, ui_manager: pygame_gui.UIManager, gamestate: GameState):
         super().__init__(displaysurface)
         self._display_surf = displaysurface
-        self._radar_surf = pygame.Surface(self._display_surf.get_size(), pygame.SRCALPHA)
         self._gamestate: GameState = gamestate
         self._drawBRAA = False
-        self.unitFont = pygame.font.SysFont('Comic Sans MS', 14)
-        self.cursorFont = pygame.font.SysFont('Comic Sans MS', 12)
+        self.cursorFont = get_sys_font('Comic Sans MS', 12)
         self.hover_obj_id: str = ""
         self.ui_manager = ui_manager
+        self._contacts_key: tuple | None = None
+        self._contacts: list[tuple[GameObject, tuple[int,int], tuple[int,int] | None]] = []
         
     def on_render(self):
         """
         Renders the radar display.
         """
         super().on_render()
-        self._radar_surf.fill((0,0,0,0)) # Fill transparent
         
-        self._draw_all_contacts(self._radar_surf)
+        # Draw straight onto the display, a full screen overlay costs a clear and an alpha blit every frame
+        self._draw_all_contacts(self._display_surf)
 
         if self._drawBRAA:
-            self._draw_BRAA(self._radar_surf, self._startBraa, self._endBraa)
+            self._draw_BRAA(self._display_surf, self._startBraa, self._endBraa)
         else:
-            self._draw_cursor(self._radar_surf, pygame.mouse.get_pos())
-            
-        self._display_surf.blit(self._radar_surf, (0,0))
+            self._draw_cursor(self._display_surf, pygame.mouse.get_pos())
         
     def on_loop(self):
         """
@@ -61,17 +62,6 @@ class Radar(Map):
         super().on_loop()
         self._gamestate.update_state()
         
-    def resize(self, width, height):
-        """
-        Resizes the radar display.
-
-        Args:
-            width (int): The new width of the display.
-            height (int): The new height of the display.
-        """
-        super().resize(width, height)
-        self._radar_surf = pygame.Surface(self._display_surf.get_size(), pygame.SRCALPHA)
-
     def _draw_BRAA(self, surface: pygame.Surface, start: tuple[int,int], end: tuple[int,int], 
                   color: tuple[int,int,int] = (255,165,0), size: int = 2) -> None:
         """
@@ -94,7 +84,7 @@ class Radar(Map):
         bearing = self._world_bearing(start_world, end_world)
                 
         
-        text_surface = self.cursorFont.render(f"{bearing:.0f}/{distance_NM:.0f}", True, color)
+        text_surface = render_text_cached(self.cursorFont, f"{bearing:.0f}/{distance_NM:.0f}", color)
         textrect = pygame.Rect((0,0),text_surface.get_size())
         textrect.topleft = (end[0] + 10, end[1] + 10)
         surface.blit(text_surface, textrect)
@@ -114,25 +104,65 @@ class Radar(Map):
         
         polar = self.get_pos_world_bullseye_relative(self._screen_to_world(pos))
         
-        text_surface = self.cursorFont.render(f"{polar[0]:.0f}, {polar[1]:.0f}", True, (255,0,0)) #TODO fix color
+        text_surface = render_text_cached(self.cursorFont, f"{polar[0]:.0f}, {polar[1]:.0f}", (255,0,0)) #TODO fix color
         textrect = pygame.Rect((0,0),text_surface.get_size())
         textrect.topleft = (pos[0] + 10, pos[1] + 10)
         surface.blit(text_surface, textrect)
         
-    def _draw_contact(self, surface: pygame.Surface, obj: GameObject) -> None:
+    def _draw_contact(self, surface: pygame.Surface, obj: GameObject, pos: tuple[int,int], px_per_nm: float,
+                      target_pos: tuple[int,int] | None) -> None:
         
-        if obj.locked_target is not None:
-            obj.draw(surface, self._world_to_screen(obj.get_pos()), self._px_per_nm(), 
-                     target_pos=self._world_to_screen(obj.locked_target.get_pos()))
+        if target_pos is not None:
+            obj.draw(surface, pos, px_per_nm, target_pos=target_pos)
         else:
-            obj.draw(surface, self._world_to_screen(obj.get_pos()), self._px_per_nm())
+            obj.draw(surface, pos, px_per_nm)
         
     def _draw_all_contacts(self, surface: pygame.Surface) -> None:
         
-        for drawable_type in CLASS_MAP.values():
-            for id in self._gamestate.objects[drawable_type]:
-                obj = self._gamestate.objects[drawable_type][id]
-                self._draw_contact(surface, obj)
+        px_per_nm = self._px_per_nm() # Constant for the whole frame, don't recompute per contact
+        canvas_size = self._map_source.get_size()
+        offset = (self.offset.x, self.offset.y)
+        surface_width, surface_height = surface.get_size()
+        
+        # Hidden classes never draw, leave them out before any of their positions are transformed
+        drawable_types = [drawable_type for drawable_type in CLASS_MAP.values() if not drawable_type.hide_class]
+        
+        # Contacts only move when the game state or the view changes, most frames can reuse the last positions
+        contacts_key = (self._gamestate.version, self._scale_c2s, offset, canvas_size, (surface_width, surface_height),
+                        tuple(drawable_types))
+        if contacts_key != self._contacts_key:
+            
+            # Gather every class into one flat list (in draw order) so the transform and culling run once
+            class_objects = [self._gamestate.objects[drawable_type].values() for drawable_type in drawable_types]
+            objects = [obj for objs in class_objects for obj in objs]
+            
+            # Transform all the positions to screen space in one go
+            world_positions = np.array([obj.get_pos() for obj in objects], dtype=float).reshape(-1, 2)
+            screen_positions = world_to_screen_array(world_positions, canvas_size, self._scale_c2s, offset)
+            
+            # Drop contacts that are off screen before drawing them, the same test as GameObject.is_visible
+            x, y = screen_positions[:, 0], screen_positions[:, 1]
+            on_screen = (x >= 0) & (x < surface_width) & (y >= 0) & (y < surface_height)
+            on_screen |= np.repeat([drawable_type.draws_off_screen for drawable_type in drawable_types], 
+                                   [len(objs) for objs in class_objects])
+            
+            # Lock targets only change with the game state too, keep their screen positions with the contacts
+            visible_objects = [objects[i] for i in np.flatnonzero(on_screen).tolist()]
+            targets = [obj.locked_target for obj in visible_objects if obj.locked_target is not None]
+            target_positions: Iterator[tuple[int,int]] = iter([])
+            if targets:
+                target_world = np.array([target.get_pos() for target in targets], dtype=float)
+                target_positions = map(tuple, world_to_screen_array(target_world, canvas_size, self._scale_c2s, 
+                                                                    offset).tolist())
+            
+            self._contacts = []
+            for obj, pos in zip(visible_objects, map(tuple, screen_positions[on_screen].tolist())):
+                target_pos = next(target_positions) if obj.locked_target is not None else None
+                self._contacts.append((obj, pos, target_pos))
+            self._contacts_key = contacts_key
+        
+        for obj, pos, target_pos in self._contacts:
+            self._draw_contact(surface, obj, pos, px_per_nm, target_pos)
     
     def meters_to_ft(self, meters: float) -> int:
         return int(meters * METERS_TO_FT)    
@@ -160,8 +190,9 @@ class Radar(Map):
         Returns:
             tuple[float,float]: (Bearing, Distance) The position of the cursor relative to the bullseye.
         """        
-        bearing = self._world_bearing(self._gamestate.get_bullseye_pos(), pos_world)
-        distance = self._world_distance(self._gamestate.get_bullseye_pos(), pos_world)
+        bullseye_pos = self._gamestate.get_bullseye_pos()
+        bearing = self._world_bearing(bullseye_pos, pos_world)
+        distance = self._world_distance(bullseye_pos, pos_world)
         
         return bearing, distance
     
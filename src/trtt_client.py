@@ -29,20 +29,26 @@ class Buffer:
 
     def __init__(self, sock: socket.socket):
         self.sock = sock
-        self.buffer = b''
+        self.buffer = bytearray() # bytearray grows in place, bytes += would copy the whole buffer on every recv
+        self.recv_buffer = memoryview(bytearray(1024)) # Received into directly, so recv doesn't allocate a new bytes object each call
 
     def get_handshake(self):
         return self.get_line("\0")
     
     def get_line(self, seperator="\n"):
+        sep = seperator.encode("utf-8")
         try:
-            while seperator.encode("utf-8") not in self.buffer:
-                data = self.sock.recv(1024) #TODO try except
-                if not data: # socket closed
+            end = self.buffer.find(sep)
+            while end < 0:
+                searched = max(len(self.buffer) - len(sep) + 1, 0) # Only search the newly received data
+                num_bytes = self.sock.recv_into(self.recv_buffer) #TODO try except
+                if not num_bytes: # socket closed
                     return None
-                self.buffer += data
-            line,sep,self.buffer = self.buffer.partition(seperator.encode("utf-8"))
-            return line.decode()
+                self.buffer += self.recv_buffer[:num_bytes]
+                end = self.buffer.find(sep, searched)
+            line = self.buffer[:end].decode()
+            del self.buffer[:end + len(sep)] # Consume in place rather than copying the remainder
+            return line
         except ConnectionAbortedError:
             return None
 